@@ -31,6 +31,8 @@ import sys
 import os
 import re
 import argparse
+import subprocess
+import random
 
 
 def _err_msg():
@@ -110,6 +112,33 @@ def get_cmd_argparser():
         help='Select render mode. Currently supported: default (ie single view), multiview (ie moving cameras) dataset',
         dest='render_mode')
 
+    parser.add_argument(
+        '--start-index',
+        type=int,
+        default=None,
+        dest='start_index',
+        help='Index of the first (static) scene to render. Default: 0')
+
+    parser.add_argument(
+        '--end-index',
+        type=int,
+        default=None,
+        dest='end_index',
+        help='Index after the last (static) scene to render. Default: number of scenes in the dataset')
+
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of blender processes to split the rendering of the dataset into. Default: 1')
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Seed for the random number generators. Each (static) scene is seeded individually, '
+             'such that results do not depend on how rendering is split')
+
     parser.add_argument(
         '--list-scenes',
         action='store_true',
@@ -157,6 +186,42 @@ def determine_scene_type(config_file):
     return scene_type
 
 
+def render_parallel(argv, jobs: int, index_range: tuple, seed: int = None):
+    """Split the rendering of a dataset into several blender processes.
+
+    Each process renders a disjoint range of (static) scenes into the same
+    dataset directory. Hence, there is nothing to merge after all processes
+    finished.
+
+    Args:
+        argv(list): command line arguments to pass to each process
+        jobs(int): number of processes to start
+        index_range(tuple): range [start, end) of (static) scenes to split
+        seed(int): seed for the random number generators. If None, a random
+            seed is drawn such that all processes use the same base seed
+
+    Returns:
+        True if all processes succeeded, False otherwise
+    """
+    import bpy
+    from amira_blender_rendering.dataset import split_index_range
+
+    if seed is None:
+        seed = random.randrange(2**31)
+
+    procs = list()
+    for chunk_start, chunk_end in split_index_range(index_range, jobs):
+        # blender exits with 0 even if the script fails, unless told otherwise
+        cmd = [bpy.app.binary_path, '-b', '--python-exit-code', '1', '-P', os.path.abspath(__file__), '--'] + argv + [
+            '--jobs', '1',
+            '--seed', str(seed),
+            '--start-index', str(chunk_start),
+            '--end-index', str(chunk_end)]
+        procs.append(subprocess.Popen(cmd))
+
+    return all([p.wait() == 0 for p in procs])
+
+
 def main():
 
     # parse command arguments
@@ -215,15 +280,33 @@ def main():
     config.parse_file(configfile)
     config.parse_args(argv=argv)
 
+    # split rendering into multiple blender processes if requested. Each of them
+    # will parse the configuration on its own and render a range of scenes
+    if args.jobs > 1:
+        from amira_blender_rendering.dataset import get_index_range
+        index_range = get_index_range(
+            scene_types[scene_type_str.lower()]['scene'].get_scene_count(config, cmd_args.render_mode),
+            (args.start_index, args.end_index))
+        success = render_parallel(argv, args.jobs, index_range, seed=args.seed)
+        if not success:
+            logger.error("Error while generating dataset in parallel")
+        sys.exit(0 if success else 1)
+
     # instantiate the scene.
     # NOTE: we do not automatically create splitting configs anymore. You need
     #       to run the script twice, with two different configurations, to
     #       generate the split. This is significantly easier than internally
     #       maintaining split configurations.
-    scene = scene_types[scene_type_str.lower()]['scene'](config=config, render_mode=cmd_args.render_mode)
+    scene = scene_types[scene_type_str.lower()]['scene'](
+        config=config,
+        render_mode=cmd_args.render_mode,
+        index_range=(args.start_index, args.end_index),
+        seed=args.seed)
     # save the config early. In case something goes wrong during rendering, we
-    # at least have the config + potentially some images
-    scene.dump_config()
+    # at least have the config + potentially some images. The config is the same
+    # for all chunks of a split dataset, hence only the first chunk saves it
+    if args.start_index is None or args.start_index <= 0:
+        scene.dump_config()
 
     # generate the dataset
     success = False
@@ -235,6 +318,10 @@ def main():
     # other things opened that it should close gracefully
     scene.teardown()
 
+    # report failure, e.g. to the parent process when rendering in parallel
+    if not success:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
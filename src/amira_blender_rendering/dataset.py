@@ -22,6 +22,8 @@ things to certain scenarios which has an impact on the generated dataset.
 """
 
 import os
+import random
+import numpy as np
 # from math import ceil
 from amira_blender_rendering.utils.io import expandpath
 from amira_blender_rendering.datastructures import DynamicStruct
@@ -31,20 +33,82 @@ def get_environment_textures(base_path):
     """Determine if the user wants to set specific environment texture, or
     randomly select from a directory
 
+    Paths are expanded once here, such that they can be used directly when
+    randomly selecting a texture for each rendered scene.
+
     Args:
-        cfg(Configuration): config with render setup
+        base_path(str): path to a single texture or to a directory with textures
+
+    Returns:
+        tuple of (expanded) paths to textures, sorted to get a reproducible order
     """
     # this rise a KeyError if 'environment_texture' not in cfg
     environment_textures = expandpath(base_path)
     if os.path.isdir(environment_textures):
-        files = os.listdir(environment_textures)
-        environment_textures = [os.path.join(environment_textures, f) for f in files]
+        files = sorted(os.listdir(environment_textures))
+        environment_textures = tuple(os.path.join(environment_textures, f) for f in files)
     else:
-        environment_textures = [environment_textures]
+        environment_textures = (environment_textures, )
 
     return environment_textures
 
 
+def get_index_range(count: int, index_range: tuple = None):
+    """Determine the range [start, end) of (static scene) indices to render.
+
+    This allows to split the generation of a dataset into disjoint chunks, e.g.
+    to render them in parallel from multiple blender processes.
+
+    Args:
+        count(int): total number of indices in the dataset
+        index_range(tuple): (start, end) of the requested range. Any of the two
+            can be None, in which case it defaults to 0 and count, respectively.
+
+    Returns:
+        tuple (start, end) clamped to [0, count]
+    """
+    start, end = index_range if index_range is not None else (None, None)
+    start = 0 if start is None else max(0, min(start, count))
+    end = count if end is None else max(start, min(end, count))
+    return start, end
+
+
+def split_index_range(index_range: tuple, jobs: int):
+    """Split a range [start, end) of (static scene) indices into disjoint chunks.
+
+    Args:
+        index_range(tuple): (start, end) of the range to split
+        jobs(int): maximum number of chunks
+
+    Returns:
+        list of (start, end) tuples of consecutive, non-empty chunks which
+        together cover exactly [start, end)
+    """
+    start, end = index_range
+    delta = -(-(end - start) // max(1, jobs))
+    return [(s, min(s + delta, end)) for s in range(start, end, max(1, delta))]
+
+
+def seed_random_generators(seed: int, *keys):
+    """Seed python's and numpy's global random number generators.
+
+    The actual seed is derived from a base seed and additional integer keys,
+    e.g. the index of the scene that is rendered and the number of attempts
+    for this scene. This makes a scene reproducible, independently of how the
+    dataset generation was split into chunks.
+
+    Args:
+        seed(int): base seed. If None, the generators are left untouched.
+        keys(int): additional integer keys to derive the seed from
+    """
+    if seed is None:
+        return
+    # NOTE: numpy's legacy seeding from an array of (32 bit) integers is used,
+    # because SeedSequence is not available in numpy < 1.17 (e.g. blender 2.80)
+    np.random.seed([seed & 0xffffffff] + [k & 0xffffffff for k in keys])
+    random.seed(int(np.random.randint(2**31)))
+
+
 #
 #
 # NOTE: the functions and classes below were partially taken from amira_perception. Make
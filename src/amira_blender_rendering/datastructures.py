@@ -225,6 +225,12 @@ class DynamicStruct:
         return self._dict.__repr__()
 
 
+# members of Configuration that are stored as regular attributes. All other
+# attributes are looked up in (or written to) the configuration's dictionary
+_CONFIGURATION_MEMBERS = frozenset([
+    '_dict', '_name', '_parent', '_argparse', '_argparse_prefix', '_cfgparse', '_typeinfo', '_special', '_help'])
+
+
 class Configuration():
     """A generic configuration class.
 
@@ -458,9 +464,11 @@ class Configuration():
         """
         self._cfgparse.read(filename)
 
-        # extract all full keys from the configuration and store their values
+        # extract all full keys from the configuration and store their values.
+        # Get all (interpolated) values of a section at once instead of looking
+        # up each item via a section proxy
         for section in self._cfgparse.sections():
-            for item in self._cfgparse[section]:
+            for item, value in self._cfgparse.items(section):
                 # by default, prefix is the section name
                 prefix = section + '.'
 
@@ -479,7 +487,7 @@ class Configuration():
                     continue
 
                 # set key, type cercion happens within __setitem__
-                self[key] = self._cfgparse[section][item]
+                self[key] = value
 
     def _parse_args(self, only_section: str, argv=None):
         # extract all known arguments for the local configuration
@@ -530,19 +538,13 @@ class Configuration():
         return argp_list
 
     def __getattr__(self, key):
-        if key in [
-                '_dict', '_name', '_parent', '_argparse', '_argparse_prefix', '_cfgparse', '_typeinfo', '_special',
-                '_help'
-        ]:
+        if key in _CONFIGURATION_MEMBERS:
             return super(Configuration, self).__getattr__(key)
         else:
             return self._dict[key]
 
     def __setattr__(self, key, value):
-        if key in [
-                '_dict', '_name', '_parent', '_argparse', '_argparse_prefix', '_cfgparse', '_typeinfo', '_special',
-                '_help'
-        ]:
+        if key in _CONFIGURATION_MEMBERS:
             super(Configuration, self).__setattr__(key, value)
         else:
             self[key] = value
@@ -97,9 +97,33 @@ def _save_camera_locations_to_blend(name: str, locations: list, filepath: str):
 # TODO: derive scenes in abr.scenes from this class
 class ABRScene():
     """interface of functions that each sccene needs to adhere to"""
+
+    # render modes supported by the scene. Scenes fall back to 'default' for any other mode
+    render_modes = ('default', 'multiview')
+
     def __init__(self):
         pass
 
+    @classmethod
+    def get_scene_count(cls, config, render_mode: str = 'default'):
+        """Get the number of (static) scenes that are rendered for a configuration.
+
+        This resolves the scene's fallback of the render mode, and mirrors how
+        the scenes post-process dataset.scene_count, without instantiating a scene.
+
+        Args:
+            config(Configuration): scene configuration
+            render_mode(str): requested render mode
+
+        Returns:
+            number of (static) scenes
+        """
+        if render_mode not in cls.render_modes:
+            render_mode = 'default'
+        if render_mode == 'multiview':
+            return max(1, config.dataset.scene_count)
+        return config.dataset.image_count
+
     def dump_config(self):
         raise NotImplementedError()
 
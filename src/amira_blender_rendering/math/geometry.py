@@ -24,7 +24,7 @@ rotation matrix computations, conversions between OpenGL and OpenCV, etc.
 
 import bpy
 from math import pi
-from mathutils import Vector, Euler
+from mathutils import Vector, Euler, Matrix
 from mathutils.bvhtree import BVHTree
 from amira_blender_rendering.utils.logging import get_logger
 import numpy as np
@@ -94,6 +94,46 @@ def p2d_to_pixel_coords(p: Vector, render: bpy.types.RenderSettings = bpy.contex
                    (render.resolution_y - 1) * (p.y - 1.0) / -2.0))
 
 
+def project_points_to_pixel_coords(points: np.ndarray,
+                                   camera: bpy.types.Object,
+                                   render: bpy.types.RenderSettings) -> np.ndarray:
+    """Project multiple 3D points onto the image plane of a camera and convert
+    them to pixel coordinates.
+
+    This is the vectorized equivalent of calling project_p3d followed by
+    p2d_to_pixel_coords for each point.
+
+    Args:
+        points (np.ndarray): Nx3 array of 3D points in world coordinates
+        camera (bpy.types.Object): blender camera to use for projection
+        render (bpy.types.RenderSettings): render settings used for computation
+
+    Returns:
+        Nx2 array with screen space (pixel) coordinates of the points
+    """
+
+    if camera.type != 'CAMERA':
+        raise Exception(f"Object {camera.name} is not a camera")
+
+    # combined model-view and projection matrix
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    projection = camera.calc_matrix_camera(
+        depsgraph,
+        x=render.resolution_x,
+        y=render.resolution_y,
+        scale_x=render.pixel_aspect_x,
+        scale_y=render.pixel_aspect_y)
+    P = np.asarray(projection @ camera.matrix_world.inverted())
+
+    # project all points at once and normalize to normalized device coordinates
+    p_hom = points @ P[:, :3].T + P[:, 3]
+    ndc = p_hom[:, :2] / p_hom[:, 3:]
+
+    # convert to pixel coordinates
+    return np.column_stack(((render.resolution_x - 1) * (ndc[:, 0] + 1.0) / +2.0,
+                            (render.resolution_y - 1) * (ndc[:, 1] - 1.0) / -2.0))
+
+
 def get_relative_rotation(obj1: bpy.types.Object, obj2: bpy.types.Object = bpy.context.scene.camera) -> Euler:
     """Get the relative rotation between two objects in terms of the second
     object's coordinate system. Note that the second object will be default
@@ -414,6 +454,60 @@ def euler_z_to_matrix(angle):
         [0, 0, 1]])
 
 
+def euler_xyz_to_matrix(angles):
+    """Get rotation matrix from euler angles (in radians) in XYZ order.
+
+    This is the numpy equivalent of mathutils.Euler(angles).to_matrix(), i.e.,
+    rotation around X is applied first, followed by Y and Z.
+    """
+    return euler_z_to_matrix(angles[2]) @ euler_y_to_matrix(angles[1]) @ euler_x_to_matrix(angles[0])
+
+
+def decompose_world_matrix(matrix_world):
+    """Split a 4x4 world matrix into a normalized rotation and a translation.
+
+    The rotation corresponds to matrix_world.to_3x3().normalized() and the
+    translation to matrix_world.to_translation(), but both are computed on numpy
+    arrays to avoid repeated conversions between mathutils and numpy.
+
+    Args:
+        matrix_world: 4x4 world matrix (mathutils.Matrix or array-like)
+
+    Returns:
+        tuple of (3x3 rotation, 3-vector translation) as np.array
+    """
+    M = np.asarray(matrix_world, dtype=np.float64)
+    R = M[:3, :3]
+    return R / np.linalg.norm(R, axis=0), M[:3, 3].copy()
+
+
+def get_relative_pose_to_cam(obj, cam, zeroing=(90, 0, 0)):
+    """Get the relative rotation and translation between an object and a camera
+    in the camera's frame of reference.
+
+    This is equivalent to get_relative_rotation_to_cam_deg(obj, cam, zeroing).to_matrix()
+    and get_relative_translation(obj, cam), but computed mostly in numpy to avoid
+    repeated conversions between mathutils and numpy.
+
+    Args:
+        obj: object to compute relative pose for
+        cam: camera to used
+        zeroing: camera zeroing angles (in degrees)
+
+    Returns:
+        tuple of (3x3 rotation, 3-vector translation) as np.array
+    """
+    R_obj, t_obj = decompose_world_matrix(obj.matrix_world)
+    R_cam, t_cam = decompose_world_matrix(cam.matrix_world)
+    R_cam_inv = np.linalg.inv(R_cam)
+    R = euler_xyz_to_matrix(np.radians(zeroing)) @ R_cam_inv @ R_obj
+    # normalized world matrices are not orthogonal for sheared transforms, e.g. for
+    # children of non-uniformly scaled parents. Turn R into a proper rotation the
+    # same way as get_relative_rotation_to_cam_deg does, i.e. via euler angles
+    R = np.asarray(Matrix(R.tolist()).to_euler().to_matrix())
+    return R, R_cam_inv @ (t_obj - t_cam)
+
+
 def rotation_matrix(alpha, axis, homogeneous=False):
     """Euler rotation matrices
 
@@ -200,13 +200,15 @@ class CompositorNodesOutputRenderedObjects():
         # exception)
 
         # set all members and compute path related specifications
-        self.dirinfo = dirinfo
         self.base_filename = render_filename
         self.objs = objs
         self.scene = scene
-        # extract paths and update in node
-        self.__extract_pathspec()
-        self.__update_node_paths()
+        # extract paths and update in node. The directory information usually
+        # stays the same across many frames, i.e. only do this if it changed
+        if dirinfo is not self.dirinfo:
+            self.dirinfo = dirinfo
+            self.__extract_pathspec()
+            self.__update_node_paths()
 
         self.sockets['s_render'].path = os.path.join(self.path_rgb, f'{self.base_filename}.png####')
         self.sockets['s_depth_map'].path = os.path.join(self.path_range, f'{self.base_filename}.exr####')
@@ -31,15 +31,15 @@ def boundingbox_from_mask(mask):
     """
     assert len(mask.shape) == 2
 
-    # flatten to two dimensions and extract first and last non-zero entry
-    xs = np.sum(mask, axis=0)
-    ys = np.sum(mask, axis=1)
-    xs = np.nonzero(xs)
-    ys = np.nonzero(ys)
+    # flatten to two dimensions and extract first and last non-zero entry.
+    # Reducing with any() avoids accumulating (and allocating) sums
+    xs = np.flatnonzero(np.any(mask, axis=0))
+    ys = np.flatnonzero(np.any(mask, axis=1))
     # raise error if non valid, i.e., empty mask, given
-    if (xs[0].shape[0] == 0) or (ys[0].shape[0] == 0):
+    if (xs.shape[0] == 0) or (ys.shape[0] == 0):
         return None
-    x = (np.min(xs), np.max(xs))
-    y = (np.min(ys), np.max(ys))
+    # indices returned by flatnonzero are sorted
+    x = (xs[0], xs[-1])
+    y = (ys[0], ys[-1])
     return np.array([[x[0], y[0]],
                      [x[1], y[1]]])
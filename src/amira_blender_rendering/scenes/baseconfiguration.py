@@ -61,6 +61,11 @@ class BaseConfiguration(Configuration):
                        'Integrator used during path tracing. Either of PATH, BRANCHED_PATH')
         self.add_param('render_setup.denoising', True, 'Use denoising algorithms during rendering')
         self.add_param('render_setup.samples', 128, 'Samples to use during rendering')
+        self.add_param('render_setup.tile_size', 0,
+                       'Size (pixel) of square render tiles.'
+                       ' If 0, select depending on render device (GPU: 256, CPU: 32)')
+        self.add_param('render_setup.spatial_splits', True,
+                       'Use spatial splits for the BVH. Slower to build, but faster to render many samples')
         self.add_param('render_setup.color_depth', 16, 'Depth for color (RGB) image [16bit, 8bit]. Default: 16')
         self.add_param('render_setup.allow_occlusions', False, 'If True, allow objects to be occluded from camera')
         self.add_param('render_setup.motion_blur', False,
@@ -81,3 +86,6 @@ class BaseConfiguration(Configuration):
                        'If True, toggle computation of disparity map (from depth) based on given baseline (mm) value')
         self.add_param('postprocess.parallel_cameras_baseline_mm', 0,
                        'Baseline value (i.e., translation) between parallel cameras locations (in mm). Default: 0')
+        self.add_param('postprocess.annotation_decimals', 6,
+                       'Number of decimals annotations (poses, bounding boxes) are rounded to.'
+                       ' If negative, values are not rounded. Default: 6')
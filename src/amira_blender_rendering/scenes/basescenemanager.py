@@ -33,6 +33,10 @@ class BaseSceneManager():
         self.init_default_blender_config()
         self.logger = get_logger()
 
+        # environment textures (bpy.types.Image) per filepath. Environment
+        # textures are usually large HDRIs that are re-used for many images
+        self._environment_textures = dict()
+
     def init_default_blender_config(self):
         """This function is used to setup blender into a known configuration,
         such as which unit system to use."""
@@ -61,13 +65,31 @@ class BaseSceneManager():
             nodes.new('ShaderNodeTexEnvironment')
         n_envtex = nodes['Environment Texture']
 
-        # retrieve image object and set
-        img = blnd.load_img(filepath)
-        n_envtex.image = img
+        # retrieve image object and set. Images are loaded only once, and only
+        # re-assigned if they changed, because this causes blender to update the
+        # texture in the render engine
+        img = self._get_environment_texture(filepath)
+        if n_envtex.image != img:
+            n_envtex.image = img
 
         # setup link (doesn't matter if already exists, won't duplicate)
         tree.links.new(n_envtex.outputs['Color'], nodes['Background'].inputs['Color'])
 
+    def _get_environment_texture(self, filepath):
+        """Get the (cached) image data block of an environment texture"""
+        img = self._environment_textures.get(filepath)
+        if img is not None:
+            try:
+                # make sure the image was not removed from blender in the meantime
+                if img.name in bpy.data.images:
+                    return img
+            except ReferenceError:
+                pass
+
+        img = blnd.load_img(filepath)
+        self._environment_textures[filepath] = img
+        return img
+
     def set_object_texture(self, obj_name: str, filepath: str):
         """Set a specific (image) texture for the specified object.
         NOTE: if the object has specific material properites, these will be overwritten
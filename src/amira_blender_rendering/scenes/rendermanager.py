@@ -20,11 +20,19 @@
 intermediate steps."""
 
 import bpy
-from mathutils import Vector
 
 import os
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+try:
+    import cv2
+except ModuleNotFoundError:
+    cv2 = None
 try:
     import ujson as json
 except ModuleNotFoundError:
@@ -46,17 +54,140 @@ from amira_blender_rendering.utils.io import read_numpy_image_buffer
 
 logger = get_logger()
 
+# permutation of bounding box vertices from blender's order to the order used
+# in RenderedObjects datasets. See RenderManager.compute_3dbbox for details
+_BBOX_ORDER = np.array([1, 0, 2, 3, 5, 4, 6, 7])
+
+# rotation of pi around x, i.e. euler_x_to_matrix(np.pi), which turns the camera
+# from looking along -z (OpenGL) to looking along +z (OpenCV)
+_EULER_X_PI = np.diag([1.0, -1.0, -1.0])
+
+
+def _write_json(data, filepath: str):
+    """Write data to a json file.
+
+    If available, use orjson, which serializes directly to bytes that are
+    written in one go. Otherwise, fall back to (u)json. Both write the same
+    layout (indentation of 2, UTF-8), such that annotations do not depend on
+    the available json backend.
+    """
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
 
 class RenderManager(abr_scenes.BaseSceneManager):
     # NOTE: you must call setup_compositor manually when using this class!
 
-    def __init__(self, unit_conversion=bu_to_mm):
+    def __init__(self, unit_conversion=bu_to_mm, decimals: int = 6):
         # this will initialize a BaseSceneManager, which is used for setting
         # environment textures, to reset blender, or to initialize default
         # blender settings
         super(RenderManager, self).__init__()
         self.unit_conversion = unit_conversion
 
+        # number of decimals that annotation values are rounded to before
+        # writing them out. None or a negative value keep full double precision
+        self.decimals = decimals
+
+        # values that are constant across the frames of a dataset, and which
+        # therefore only need to be computed once: calibration matrices per
+        # camera intrinsics and resolution, and output directories that already exist
+        self._calibration_cache = dict()
+        self._existing_dirs = set()
+
+        # whether the view layer has to be updated before postprocessing a frame,
+        # i.e. whether objects might have moved since the last update
+        self._view_layer_dirty = True
+
+        # annotations are written in background threads while the next frame
+        # is rendered. Note that anything touching bpy must stay in the main thread
+        self._writer = ThreadPoolExecutor(max_workers=4)
+        self._pending_writes = list()
+
+    def _get_calibration_matrix(self, camera, res_x: int, res_y: int):
+        """Get the (cached) calibration matrix of a camera.
+
+        The matrix is recomputed only if the camera, its intrinsics (lens, sensor,
+        shift), or the render resolution change.
+
+        Args:
+            camera(bpy.types.Camera): camera object
+            res_x(int): render resolution along x
+            res_y(int): render resolution along y
+
+        Returns:
+            np.array(3,3) calibration matrix
+        """
+        cam = camera.data
+        render = bpy.context.scene.render
+        key = (cam.as_pointer(), res_x, res_y,
+               cam.lens, cam.sensor_width, cam.sensor_height, cam.sensor_fit, cam.shift_x, cam.shift_y,
+               render.resolution_percentage, render.pixel_aspect_x, render.pixel_aspect_y)
+        if key not in self._calibration_cache:
+            self._calibration_cache[key] = np.asarray(
+                camera_utils.get_calibration_matrix(bpy.context.scene, cam))
+        return self._calibration_cache[key]
+
+    def update_view_layer(self):
+        """Update the view layer, i.e. re-evaluate the dependency graph.
+
+        Scenes that move objects should update the view layer with this method
+        rather than directly via the dependency graph. This way, postprocess knows
+        that transforms are up to date and skips another (potentially expensive)
+        update of the view layer. Note that this only holds for the current frame,
+        and only if nothing is moved after calling this method.
+        """
+        bpy.context.view_layer.update()
+        self._view_layer_dirty = False
+
+    def _submit_write(self, fn, *args, **kwargs):
+        """Submit a function that writes data to disk to the background writer.
+
+        Writes that finished successfully are dropped from the list of pending
+        writes. Failed writes are kept, such that their errors are raised from
+        check_writes or wait_for_writes.
+        """
+        pending = [f for f in self._pending_writes if not f.done() or f.exception() is not None]
+        pending.append(self._writer.submit(fn, *args, **kwargs))
+        self._pending_writes = pending
+
+    def check_writes(self):
+        """Raise errors of background writes that already finished.
+
+        Errors are raised as RuntimeError, such that they are not mistaken for a
+        problem of the frame that is currently processed (scenes retry frames on
+        ValueError).
+        """
+        failed = [f for f in self._pending_writes if f.done() and f.exception() is not None]
+        if failed:
+            self._pending_writes = [f for f in self._pending_writes if f not in failed]
+            raise RuntimeError('Writing annotations of a previous frame failed') from failed[0].exception()
+
+    def wait_for_writes(self):
+        """Block until all data that was submitted to the background writer is
+        written to disk. Errors that occured while writing are raised here."""
+        pending = self._pending_writes
+        self._pending_writes = list()
+        for f in pending:
+            f.result()
+
+    def teardown(self):
+        """Wait for all pending writes, and shut down the background writer"""
+        try:
+            self.wait_for_writes()
+        finally:
+            self._writer.shutdown(wait=True)
+
+    def _makedirs(self, path: str):
+        """Create a directory (tree), unless it was already created before"""
+        if path not in self._existing_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._existing_dirs.add(path)
+
     def postprocess(self, dirinfo, base_filename, camera, objs, zeroing, **kwargs):
         """Postprocessing the scene.
 
@@ -75,15 +206,24 @@ class RenderManager(abr_scenes.BaseSceneManager):
             postprocess_config(Configuration): postprocess specific config.
                 See abr/scenes/baseconfiguration and scene configs for specific configuration values.
         """
+        # fail early if annotations of a previous frame could not be written
+        self.check_writes()
+
         # get postprocess specific configs
         postprocess_config = kwargs.get('postprocess_config', abr_scenes.BaseConfiguration().postprocess)
 
-        # camera matrix
-        K_cam = np.asarray(camera_utils.get_calibration_matrix(bpy.context.scene, camera.data))
+        # render resolution and camera matrix
+        render = bpy.context.scene.render
+        res_x, res_y = render.resolution_x, render.resolution_y
+        K_cam = self._get_calibration_matrix(camera, res_x, res_y)
 
         # first we update the view-layer to get the updated values in
-        # translation and rotation
-        bpy.context.view_layer.update()
+        # translation and rotation, unless this already happened after objects
+        # were moved for this frame. Objects for the next frame might be moved
+        # without calling update_view_layer, so assume they are from now on
+        if self._view_layer_dirty:
+            bpy.context.view_layer.update()
+        self._view_layer_dirty = True
 
         # the compositor postprocessing takes care of fixing file names
         # and saving the masks filename into objs
@@ -95,16 +235,15 @@ class RenderManager(abr_scenes.BaseSceneManager):
         fpath_range = os.path.join(dirinfo.images.range, f'{base_filename}.exr')
 
         # filenames (ranges are stored as true exr values, depth as 16 bit png)
-        if not os.path.exists(dirinfo.images.depth):
-            os.mkdir(dirinfo.images.depth)
+        self._makedirs(dirinfo.images.depth)
         fpath_depth = os.path.join(dirinfo.images.depth, f'{base_filename}.png')
 
         # convert
         camera_utils.project_pinhole_range_to_rectified_depth(
             fpath_range,
             fpath_depth,
-            res_x=bpy.context.scene.render.resolution_x,
-            res_y=bpy.context.scene.render.resolution_y,
+            res_x=res_x,
+            res_y=res_y,
             calibration_matrix=K_cam,
             scale=postprocess_config.depth_scale)
 
@@ -117,43 +256,62 @@ class RenderManager(abr_scenes.BaseSceneManager):
             if any([c for c in postprocess_config.parallel_cameras if c in camera.name]):
                 # use precomputed depth if available, otherwise use range map
                 dirpath = os.path.join(dirinfo.images.base_path, 'disparity')
-                if not os.path.exists(dirpath):
-                    os.mkdir(dirpath)
+                self._makedirs(dirpath)
                 fpath_disparity = os.path.join(dirpath, f'{base_filename}.png')
                 # compute map
                 camera_utils.compute_disparity_from_z_info(fpath_depth,
                                                            fpath_disparity,
                                                            baseline_mm=postprocess_config.parallel_cameras_baseline_mm,
                                                            calibration_matrix=K_cam,
-                                                           res_x=bpy.context.scene.render.resolution_x,
-                                                           res_y=bpy.context.scene.render.resolution_y,
+                                                           res_x=res_x,
+                                                           res_y=res_y,
                                                            scale=postprocess_config.depth_scale)
 
         # compute bounding boxes and save annotations
+        render_results = [
+            self.build_render_result(obj, camera, zeroing, postprocess_config.visibility_from_mask)
+            for obj in objs]
+
+        # only annotate visible objects. Note that visibility might have been
+        # updated while building the render results. If there's no visible object,
+        # add single instance results to have general scene information annotated
+        visible = np.fromiter((obj['visible'] for obj in objs), dtype=bool, count=len(objs))
+        indices = np.flatnonzero(visible) if visible.any() else range(min(len(objs), 1))
+
         results_gl = ResultsCollection()
         results_cv = ResultsCollection()
-        for obj in objs:
-            render_result_gl, render_result_cv = self.build_render_result(
-                obj, camera, zeroing, postprocess_config.visibility_from_mask)
-            if obj['visible']:
-                results_gl.add_result(render_result_gl)
-                results_cv.add_result(render_result_cv)
-        # if there's no visible object, add single instance results to have general scene information annotated
-        if len(results_gl) == 0:
-            results_gl.add_result(render_result_gl)
-        if len(results_cv) == 0:
-            results_cv.add_result(render_result_cv)
-        self.save_annotations(dirinfo, base_filename, results_gl, results_cv)
-
-    def setup_renderer(self, integrator: str, enable_denoising: bool, samples: int, motion_blur: bool):
+        results_gl.add_results(render_results[i][0] for i in indices)
+        results_cv.add_results(render_results[i][1] for i in indices)
+        self._submit_write(self.save_annotations, dirinfo, base_filename, results_gl, results_cv)
+
+    def setup_renderer(self, integrator: str, enable_denoising: bool, samples: int, motion_blur: bool,
+                       tile_size: int = 0, spatial_splits: bool = True):
         """Setup blender CUDA rendering, and specify number of samples per pixel to
         use during rendering. If the setting render_setup.samples is not set in the
         configuration, the function defaults to 128 samples per image.
+
+        Opt Args:
+            tile_size(int): size (in pixel) of the square tiles that are rendered at once.
+                If 0, select a default depending on the render device, i.e. large tiles
+                (256) on GPUs and small tiles (32) on CPUs.
+            spatial_splits(bool): use spatial splits when building the BVH.
         """
         blnd.activate_cuda_devices()
         # TODO: this hardcodes cycles, but we want a user to specify this
         bpy.context.scene.render.engine = "CYCLES"
 
+        # GPUs are only saturated with large tiles, whereas CPUs perform better
+        # with small ones. Powers of two perform best in both cases
+        if tile_size <= 0:
+            tile_size = 256 if bpy.context.scene.cycles.device == 'GPU' else 32
+        bpy.context.scene.render.tile_x = tile_size
+        bpy.context.scene.render.tile_y = tile_size
+        self.logger.info(f"tile size set to {tile_size}x{tile_size}")
+
+        # spatial splits take longer to build the BVH, but speed up rendering
+        # of each sample. This pays off as we render many samples per image
+        bpy.context.scene.cycles.debug_use_spatial_splits = spatial_splits
+
         # determine which path tracer is setup in the blender file
         if integrator == 'BRANCHED_PATH':
             self.logger.info("integrator set to branched path tracing")
@@ -204,6 +362,23 @@ class RenderManager(abr_scenes.BaseSceneManager):
 
         return result
 
+    def quantize(self, render_result):
+        """Round floating point values of render_result to self.decimals decimals.
+
+        Annotations do not need double precision, and shorter numbers considerably
+        reduce the size of the written json files.
+        """
+        if self.decimals is None or self.decimals < 0:
+            return render_result
+
+        result = render_result
+        for key in ('q', 't', 'corners2d', 'corners3d', 'aabb', 'oobb', 'q_cam', 't_cam'):
+            value = getattr(result, key)
+            if value is not None:
+                setattr(result, key, np.round(value, self.decimals))
+
+        return result
+
     def build_render_result(self, obj, camera, zeroing, visibility_from_mask: bool = False):
         """Create render result.
 
@@ -223,12 +398,11 @@ class RenderManager(abr_scenes.BaseSceneManager):
         # create a pose render result. leave image fields empty, they will
         # currenlty not go to the state dict. this is only here to make sure
         # that we actually get the state dict defined in pose render result
-        t = np.asarray(abr_geom.get_relative_translation(obj['bpy'], camera))
-        R = np.asarray(abr_geom.get_relative_rotation_to_cam_deg(obj['bpy'], camera, Vector(zeroing)).to_matrix())
-
         # camera world coordinate transformation
-        t_cam = np.asarray(camera.matrix_world.to_translation())
-        R_cam = np.asarray(camera.matrix_world.to_3x3().normalized())
+        R_cam, t_cam = abr_geom.decompose_world_matrix(camera.matrix_world)
+
+        # relative transformation between object and camera in the camera's frame of reference
+        R, t = abr_geom.get_relative_pose_to_cam(obj['bpy'], camera, zeroing)
 
         # compute bounding boxes
         corners2d, corners3d, aabb, oobb = None, None, None, None
@@ -272,7 +446,7 @@ class RenderManager(abr_scenes.BaseSceneManager):
         # format it is assumed the camera looks towards positive z (rotation of pi around x)
         # Thus to express the rotation in world coordinate we post-multiply the rotation matrix.
         # However, its position/location wrt to the world coordinate system does not change.
-        R_cam_cv = R_cam.dot(abr_geom.euler_x_to_matrix(np.pi))
+        R_cam_cv = R_cam @ _EULER_X_PI
         t_cam_cv = t_cam
 
         render_result_cv = PoseRenderResult(
@@ -296,8 +470,8 @@ class RenderManager(abr_scenes.BaseSceneManager):
             camera_translation=t_cam_cv)
 
         # convert to desired units
-        render_result_gl = self.convert_units(render_result_gl)
-        render_result_cv = self.convert_units(render_result_cv)
+        render_result_gl = self.quantize(self.convert_units(render_result_gl))
+        render_result_cv = self.quantize(self.convert_units(render_result_cv))
         return render_result_gl, render_result_cv
 
     def save_annotations(self, dirinfo, base_filename, results_gl: ResultsCollection, results_cv: ResultsCollection):
@@ -310,21 +484,16 @@ class RenderManager(abr_scenes.BaseSceneManager):
         """
         # check if directory structure is already there
         for k in dirinfo.annotations:
-            if not os.path.exists(dirinfo.annotations[k]):
-                os.makedirs(dirinfo.annotations[k], exist_ok=True)  # create entire tree if necessary
+            self._makedirs(dirinfo.annotations[k])  # create entire tree if necessary
 
         # first dump to json opengl data
         fname_json = f"{base_filename}.json"
         fpath_json = os.path.join(dirinfo.annotations.opengl, f"{fname_json}")
-        json_data = results_gl.state_dict()
-        with open(fpath_json, 'w') as f:
-            json.dump(json_data, f, indent=0)
+        _write_json(results_gl.state_dict(), fpath_json)
 
         # second dump to json opencv data
         fpath_json = os.path.join(dirinfo.annotations.opencv, f'{fname_json}')
-        json_data = results_cv.state_dict()
-        with open(fpath_json, 'w') as f:
-            json.dump(json_data, f, indent=0)
+        _write_json(results_cv.state_dict(), fpath_json)
 
         # create xml annotation files according to PASCAL VOC format
         # TODO: this should be an option or convert afterwards. Not everyone wants to convert to PASCAL_VOC
@@ -340,26 +509,42 @@ class RenderManager(abr_scenes.BaseSceneManager):
         which node is currently selected in the node editor... I have yet to find a
         programmatic way that circumvents re-loading the file from disk
 
+        If OpenCV is available, the mask is decoded directly into a single
+        channel integer image, which is significantly faster than going through
+        blender's image API.
+
         Args:
             fname_mask(str): mask filename
 
         Raises:
             ValueError if an empty mask is given
         """
-        mask = read_numpy_image_buffer(fname_mask)
+        mask = None
+        if cv2 is not None:
+            mask = cv2.imread(fname_mask, cv2.IMREAD_GRAYSCALE | cv2.IMREAD_ANYDEPTH)
+        if mask is None:
+            mask = read_numpy_image_buffer(fname_mask)
+        else:
+            # OpenCV returns rows top to bottom, blender bottom to top. Convert
+            # to the same layout as read_numpy_image_buffer for consistent results.
+            # NOTE: reshape, not transpose, because read_numpy_image_buffer also
+            # only reinterprets blender's (rows, columns) buffer as (width, height)
+            mask = np.flipud(mask).reshape(mask.shape[1], mask.shape[0])
         return boundingbox_from_mask(mask)
 
-    def reorder_bbox(self, aabb, order=[1, 0, 2, 3, 5, 4, 6, 7]):
-        """Reorder the vertices in an aab according to a certain permutation order."""
+    def reorder_bbox(self, aabb, order=_BBOX_ORDER):
+        """Reorder the vertices in an aab according to a certain permutation order.
+
+        Numpy arrays are reordered via indexing and returned as array, any other
+        sequence is returned as list.
+        """
 
         if len(aabb) != 8:
             raise RuntimeError(f'Unexpected length of aabb (is {len(aabb)}, should be 8)')
 
-        result = list()
-        for i in range(8):
-            result.append(aabb[order[i]])
-
-        return result
+        if isinstance(aabb, np.ndarray):
+            return aabb[order]
+        return [aabb[i] for i in order]
 
     def compute_3dbbox(self, obj: bpy.types.Object):
         """Compute all 3D bounding boxes (axis aligned, object oriented, and the 3D corners
@@ -382,57 +567,32 @@ class RenderManager(abr_scenes.BaseSceneManager):
         This differs from the order of the bounding box as it was used in
         OpenGL. Ignoring the first item (centroid), the following re-indexing is
         required to get it into the correct order: [1, 0, 2, 3, 5, 4, 6, 7].
-        This will be done after getting the aabb from blender, using function
-        reorder_bbox.
-
-        TODO: probably, using numpy is not at all required, we could directly
-              store to lists. have to decide if we want this or not
+        This will be done after getting the aabb from blender, by indexing with
+        _BBOX_ORDER (see also reorder_bbox).
         """
 
         # 0. storage for numpy arrays.
         np_aabb = np.zeros((9, 3))
         np_oobb = np.zeros((9, 3))
-        np_corners3d = np.zeros((9, 2))
 
         # 1. get centroid and bounding box of object in world coordinates by
-        # applying the objects rotation matrix to the bounding box of the object
+        # applying the objects world transform to the bounding box of the object
 
         # axis aligned (no object rotation)
-        aabb = [Vector(v) for v in obj.bound_box]
-        # compute centroid
-        aa_centroid = aabb[0] + (aabb[6] - aabb[0]) / 2.0
-        # copy aabb before reordering to have access to it later
-        aabb_orig = aabb
-        # fix order of aabb for RenderedObjects
-        aabb = self.reorder_bbox(aabb)
-        # convert to numpy
-        np_aabb[0, :] = np.array((aa_centroid[0], aa_centroid[1], aa_centroid[2]))
-        for i in range(8):
-            np_aabb[i + 1, :] = np.array((aabb[i][0], aabb[i][1], aabb[i][2]))
-
-        # object aligned (that is, including object rotation)
-        oobb = [obj.matrix_world @ v for v in aabb_orig]
-        # compute oo centroid
-        oo_centroid = oobb[0] + (oobb[6] - oobb[0]) / 2.0
-        # fix order for rendered objects
-        oobb = self.reorder_bbox(oobb)
-
-        # convert to numpy
-        np_oobb[0, :] = np.array((oo_centroid[0], oo_centroid[1], oo_centroid[2]))
-        for i in range(8):
-            np_oobb[i + 1, :] = np.array((oobb[i][0], oobb[i][1], oobb[i][2]))
+        aabb = np.array(obj.bound_box)
+        # object aligned (that is, including object rotation). Transform all
+        # vertices at once
+        M_obj = np.asarray(obj.matrix_world)
+        oobb = aabb @ M_obj[:3, :3].T + M_obj[:3, 3]
+
+        # compute centroids, and fix order of vertices for RenderedObjects
+        np_aabb[0, :] = (aabb[0] + aabb[6]) / 2.0
+        np_aabb[1:, :] = aabb[_BBOX_ORDER]
+        np_oobb[0, :] = (oobb[0] + oobb[6]) / 2.0
+        np_oobb[1:, :] = oobb[_BBOX_ORDER]
 
         # project centroid+vertices and convert to pixel coordinates
-        corners3d = []
-        prj = abr_geom.project_p3d(oo_centroid, bpy.context.scene.camera)
-        pix = abr_geom.p2d_to_pixel_coords(prj)
-        corners3d.append(pix)
-        np_corners3d[0, :] = np.array((corners3d[-1][0], corners3d[-1][1]))
-
-        for i, v in enumerate(oobb):
-            prj = abr_geom.project_p3d(v, bpy.context.scene.camera)
-            pix = abr_geom.p2d_to_pixel_coords(prj)
-            corners3d.append(pix)
-            np_corners3d[i + 1, :] = np.array((corners3d[-1][0], corners3d[-1][1]))
+        scene = bpy.context.scene
+        np_corners3d = abr_geom.project_points_to_pixel_coords(np_oobb, scene.camera, scene.render)
 
         return np_aabb, np_oobb, np_corners3d
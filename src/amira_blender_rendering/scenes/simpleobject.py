@@ -28,7 +28,8 @@ import numpy as np
 from amira_blender_rendering.utils import camera as camera_utils
 from amira_blender_rendering.utils.io import expandpath
 from amira_blender_rendering.utils.logging import get_logger
-from amira_blender_rendering.dataset import get_environment_textures, build_directory_info, dump_config
+from amira_blender_rendering.dataset import get_environment_textures, build_directory_info, dump_config, \
+    get_index_range, seed_random_generators
 import amira_blender_rendering.utils.blender as blnd
 import amira_blender_rendering.nodes as abr_nodes
 import amira_blender_rendering.scenes as abr_scenes
@@ -57,22 +58,31 @@ class SimpleObject(interfaces.ABRScene):
     """Simple scene with a single object in which we have three point lighting and can set
     some background image.
     """
+
+    # only single view rendering is supported
+    render_modes = ('default', )
+
     def __init__(self, **kwargs):
         super(SimpleObject, self).__init__()
         self.logger = get_logger()
 
-        # we make use of the RenderManager
-        self.renderman = abr_scenes.RenderManager()
-
         # get the configuration, if one was passed in
         self.config = kwargs.get('config', SimpleObjectConfiguration())
 
+        # we make use of the RenderManager
+        self.renderman = abr_scenes.RenderManager(decimals=self.config.postprocess.annotation_decimals)
+
         # determine if we are rendering in multiview mode
         self.render_mode = kwargs.get('render_mode', 'default')
-        if not self.render_mode == 'default':
+        if self.render_mode not in self.render_modes:
             self.logger.warn(f'{self.__class__} scene supports only "default" render mode. Falling back to "default"')
             self.render_mode = 'default'
 
+        # range of images to render and seed for the random number generators.
+        # Both are used to split the dataset generation into multiple processes
+        self.index_range = kwargs.get('index_range', None)
+        self.seed = kwargs.get('seed', None)
+
         # we might have to post-process the configuration
         self.postprocess_config()
 
@@ -88,7 +98,9 @@ class SimpleObject(interfaces.ABRScene):
             self.config.render_setup.integrator,
             self.config.render_setup.denoising,
             self.config.render_setup.samples,
-            self.config.render_setup.motion_blur)
+            self.config.render_setup.motion_blur,
+            self.config.render_setup.tile_size,
+            self.config.render_setup.spatial_splits)
 
         # setup environment texture information
         self.setup_environment_textures()
@@ -312,7 +324,7 @@ class SimpleObject(interfaces.ABRScene):
 
     def randomize_environment_texture(self):
         # set some environment texture, randomize, and render
-        env_txt_filepath = expandpath(random.choice(self.environment_textures))
+        env_txt_filepath = random.choice(self.environment_textures)
         self.renderman.set_environment_texture(env_txt_filepath)
 
     def set_pose(self, pose):
@@ -355,8 +367,7 @@ class SimpleObject(interfaces.ABRScene):
             self.config.camera_info.height)
 
     def _update_scene(self):
-        dg = bpy.context.evaluated_depsgraph_get()
-        dg.update()
+        self.renderman.update_view_layer()
 
     def dump_config(self):
         pathlib.Path(self.dirinfo.base_path).mkdir(parents=True, exist_ok=True)
@@ -369,10 +380,17 @@ class SimpleObject(interfaces.ABRScene):
             return False
         format_width = int(ceil(log(image_count, 10)))
 
-        i = 0
-        while i < self.config.dataset.image_count:
-            # generate render filename: adhere to naming convention
-            base_filename = f"s{i:0{format_width}}_v0"
+        i, i_end = get_index_range(image_count, self.index_range)
+        i_start = i
+        # generate render filenames: adhere to naming convention
+        base_filenames = [f"s{k:0{format_width}}_v0" for k in range(i_start, i_end)]
+        attempt = 0
+        while i < i_end:
+            # make randomization reproducible for the current image (if a seed was given)
+            seed_random_generators(self.seed, i, attempt)
+            attempt += 1
+
+            base_filename = base_filenames[i - i_start]
 
             # randomize environment and object transform
             self.randomize_environment_texture()
@@ -398,8 +416,12 @@ class SimpleObject(interfaces.ABRScene):
                 self.logger.warn("ValueError during post-processing, re-generating image index {i}")
             else:
                 i = i + 1
+                attempt = 0
+
+        # make sure all annotations are written before returning
+        self.renderman.wait_for_writes()
 
         return True
 
     def teardown(self):
-        pass
+        self.renderman.teardown()
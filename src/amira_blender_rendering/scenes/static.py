@@ -35,7 +35,8 @@ from math import ceil, log
 from amira_blender_rendering.utils import camera as camera_utils
 from amira_blender_rendering.utils.io import expandpath
 from amira_blender_rendering.utils.logging import get_logger
-from amira_blender_rendering.dataset import get_environment_textures, build_directory_info, dump_config
+from amira_blender_rendering.dataset import get_environment_textures, build_directory_info, dump_config, \
+    get_index_range, seed_random_generators
 import amira_blender_rendering.scenes as abr_scenes
 import amira_blender_rendering.math.geometry as abr_geom
 import amira_blender_rendering.utils.blender as blnd
@@ -92,23 +93,28 @@ class StaticScene(interfaces.ABRScene):
         super(StaticScene, self).__init__()
         self.logger = get_logger()
 
-        # we do composition here, not inheritance anymore because it is too
-        # limiting in its capabilities. Using a render manager is a better way
-        # to handle compositor nodes
-        self.renderman = abr_scenes.RenderManager()
-
         # extract configuration, then build and activate a split config
         self.config = kwargs.get('config', StaticSceneConfiguration())
         # this check that the given configuration is (or inherits from) of the correct type
         if not isinstance(self.config, StaticSceneConfiguration):
             raise RuntimeError(f"Invalid configuration of type {type(self.config)} for class {_scene_name}")
+
+        # we do composition here, not inheritance anymore because it is too
+        # limiting in its capabilities. Using a render manager is a better way
+        # to handle compositor nodes
+        self.renderman = abr_scenes.RenderManager(decimals=self.config.postprocess.annotation_decimals)
         
         # determine if we are rendering in multiview mode
         self.render_mode = kwargs.get('render_mode', 'default')
-        if self.render_mode not in ['default', 'multiview']:
+        if self.render_mode not in self.render_modes:
             self.logger.warn(f'render mode "{self.render_mode}" not supported. Falling back to "default"')
             self.render_mode = 'default'
-        
+
+        # range of static scenes to render and seed for the random number generators.
+        # Both are used to split the dataset generation into multiple processes
+        self.index_range = kwargs.get('index_range', None)
+        self.seed = kwargs.get('seed', None)
+
         # we might have to post-process the configuration
         self.postprocess_config()
 
@@ -125,7 +131,9 @@ class StaticScene(interfaces.ABRScene):
             self.config.render_setup.integrator,
             self.config.render_setup.denoising,
             self.config.render_setup.samples,
-            self.config.render_setup.motion_blur)
+            self.config.render_setup.motion_blur,
+            self.config.render_setup.tile_size,
+            self.config.render_setup.spatial_splits)
 
         # grab environment textures
         self.setup_environment_textures()
@@ -364,12 +372,12 @@ class StaticScene(interfaces.ABRScene):
 
     def randomize_environment_texture(self):
         # set some environment texture, randomize, and render
-        env_txt_filepath = expandpath(random.choice(self.environment_textures))
+        env_txt_filepath = random.choice(self.environment_textures)
         self.renderman.set_environment_texture(env_txt_filepath)
 
     def randomize_textured_objects_textures(self):
         for obj_name in self.config.scenario_setup.textured_objects:
-            obj_txt_filepath = expandpath(random.choice(self.objects_textures))
+            obj_txt_filepath = random.choice(self.objects_textures)
             self.renderman.set_object_texture(obj_name, obj_txt_filepath)
 
     def activate_camera(self, cam_name: str):
@@ -463,6 +471,9 @@ class StaticScene(interfaces.ABRScene):
         scn_format_width = int(ceil(log(self.config.dataset.scene_count, 10)))
         
         camera_names = [self.get_camera_name(cam_str) for cam_str in self.config.scene_setup.cameras]
+        # seed once before generating camera locations, such that all chunks of a
+        # split dataset share the same multiview locations
+        seed_random_generators(self.seed)
         if self.render_mode == 'default':
             cameras_locations = camera_utils.get_current_cameras_locations(camera_names)
             for cam_name, cam_location in cameras_locations.items():
@@ -479,6 +490,9 @@ class StaticScene(interfaces.ABRScene):
         else:
             raise ValueError(f'Selected render mode {self.render_mode} not currently supported')
        
+        # range of static scenes to render
+        scn_counter, scn_end = get_index_range(self.config.dataset.scene_count, self.index_range)
+
         # some debug options
         # NOTE: at this point the object of interest have been loaded in the blender
         # file but their positions have not yet been randomized..so they should all be located
@@ -494,8 +508,9 @@ class StaticScene(interfaces.ABRScene):
                                 plot_axis=self.config.debug.plot_axis,
                                 scatter=self.config.debug.scatter)
 
-            # save all generated camera locations to .blend for later debug
-            if self.config.debug.save_to_blend:
+            # save all generated camera locations to .blend for later debug. These are
+            # shared by all chunks of a split dataset, hence only the first one saves them
+            if self.config.debug.save_to_blend and scn_counter == 0:
                 for i_cam, cam_name in enumerate(camera_names):
                     self.save_to_blend(
                         self.dirinfos[i_cam],
@@ -503,11 +518,23 @@ class StaticScene(interfaces.ABRScene):
                         camera_locations=cameras_locations[cam_name],
                         basefilename='robottable_camera_locations')
 
+        # precompute the view part of the filenames, which is shared by all scenes
+        view_filenames = dict()
+        for cam_name, cam_locations in cameras_locations.items():
+            view_format_width = int(ceil(log(len(cam_locations), 10)))
+            view_filenames[cam_name] = [f"_v{k:0{view_format_width}}" for k in range(len(cam_locations))]
+
         # control loop for the number of static scenes to render
-        scn_counter = 0
+        attempt = 0
         retry = 0
         MAX_RETRY = 5
-        while scn_counter < self.config.dataset.scene_count:
+        while scn_counter < scn_end:
+
+            # make randomization reproducible for the current scene (if a seed was given)
+            seed_random_generators(self.seed, scn_counter, attempt)
+            attempt += 1
+            # scene part of the filenames
+            scn_filename = f"s{scn_counter:0{scn_format_width}}"
 
             # randomize scene: move objects at random locations, and forward simulate physics
             self.randomize_environment_texture()
@@ -524,6 +551,7 @@ class StaticScene(interfaces.ABRScene):
             if repeat_frame:
                 self.logger.error('Something wrong (possibly due to visibility configurations).'
                                   ' Make sure your static scene and config are correct. Exiting!')
+                self.renderman.wait_for_writes()
                 exit(-1)
 
             # loop over cameras
@@ -538,14 +566,12 @@ class StaticScene(interfaces.ABRScene):
                     if retry < MAX_RETRY:
                         break
                     self.logger.error(f'Max num of {MAX_RETRY} retry reached. Check your static scene is correct. Exit')
+                    self.renderman.wait_for_writes()
                     exit(-1)
         
                 # extract camera locations
                 cam_locations = cameras_locations[cam_name]
                 
-                # compute format width
-                view_format_width = int(ceil(log(len(cam_locations), 10)))
-                
                 # activate camera
                 self.activate_camera(cam_name)
 
@@ -557,7 +583,7 @@ class StaticScene(interfaces.ABRScene):
                                      f"view {view_counter + 1}/{self.config.dataset.view_count}")
 
                     # filename
-                    base_filename = f"s{scn_counter:0{scn_format_width}}_v{view_counter:0{view_format_width}}"
+                    base_filename = scn_filename + view_filenames[cam_name][view_counter]
 
                     # set camera location
                     self.set_camera_location(cam_name, cam_loc)
@@ -626,6 +652,10 @@ class StaticScene(interfaces.ABRScene):
             # update scene counter
             if not repeat_frame:
                 scn_counter = scn_counter + 1
+                attempt = 0
+
+        # make sure all annotations are written before returning
+        self.renderman.wait_for_writes()
 
         return True
 
@@ -640,5 +670,4 @@ class StaticScene(interfaces.ABRScene):
 
     def teardown(self):
         """Tear down the scene"""
-        # nothing to do
-        pass
+        self.renderman.teardown()
@@ -115,7 +115,12 @@ def write_numpy_image_buffer(buf, filepath_out):
         # convert ('blow-up') back to RGBA pixels, required for blender's Image struct, and set Alpha to 1.0
         buf_rgba = np.repeat(buf[:, :, np.newaxis], 4, axis=2)
         buf_rgba[:, :, 3] = 1.0
-        output.pixels = buf_rgba.ravel()
+        # copy the buffer directly, if supported (blender >= 2.83), instead of
+        # converting it into a sequence of python floats first
+        if hasattr(output.pixels, 'foreach_set'):
+            output.pixels.foreach_set(buf_rgba.ravel().astype(np.float32))
+        else:
+            output.pixels = buf_rgba.ravel()
         # use save_render, because this way we get the image_settings applied to the PNG file. Unfortunately, there
         # doesn't seem to be another way to set the color mode and depth for a PNG that gets written to
         # a file.
@@ -170,7 +175,14 @@ def read_numpy_image_buffer(filepath_in, check_exr_format=False):
     # extract the first channel of the PNG image
     width = img_data.size[0]
     height = img_data.size[1]
-    buf = np.array(img_data.pixels[:], dtype=np.float32)
+    # copy pixels directly into a numpy buffer. This avoids creating an
+    # intermediate python tuple of floats (i.e. pixels[:]). Note that
+    # foreach_get on pixel arrays is only available from blender 2.83 onwards
+    if hasattr(img_data.pixels, 'foreach_get'):
+        buf = np.empty(width * height * img_data.channels, dtype=np.float32)
+        img_data.pixels.foreach_get(buf)
+    else:
+        buf = np.array(img_data.pixels[:], dtype=np.float32)
     buf = buf.reshape(width, height, img_data.channels)
     buf = buf[:, :, 0]
 
@@ -65,6 +65,28 @@ class TestGeometry(unittest.TestCase):
         self.assertEqual(Vector((4, 0, 0)), rel_t, 'Relative translation is incorrect')
         self.assertEqual(Euler((0, 0, 0)), rel_R, 'Relative rotation is incorrect')
 
+    def test_euler_xyz_to_matrix(self):
+        angles = (0.3, -1.2, 2.1)
+        npt.assert_almost_equal(np.array(Euler(angles).to_matrix()), geometry.euler_xyz_to_matrix(angles),
+                                decimal=6, err_msg='Rotation matrix from euler angles is incorrect')
+
+    def test_get_relative_pose_to_cam(self):
+        # non-trivial rotation, and a non-uniformly scaled parent to get a sheared
+        # world transform of the object
+        parent = bpy.data.objects.new('Parent', None)
+        bpy.context.scene.collection.objects.link(parent)
+        parent.scale = (1.0, 2.0, 3.0)
+        self._obj1.parent = parent
+        self._obj1.rotation_euler = Euler((0.3, -0.4, 1.1))
+        bpy.context.view_layer.update()
+
+        for zeroing in [(0, 0, 0), (90, 0, 0)]:
+            R, t = geometry.get_relative_pose_to_cam(self._obj1, self._cam, zeroing)
+            R_gt = geometry.get_relative_rotation_to_cam_deg(self._obj1, self._cam, Vector(zeroing)).to_matrix()
+            t_gt = geometry.get_relative_translation(self._obj1, self._cam)
+            npt.assert_almost_equal(np.array(R_gt), R, decimal=5, err_msg='Relative rotation is incorrect')
+            npt.assert_almost_equal(np.array(t_gt), t, decimal=5, err_msg='Relative translation is incorrect')
+
     def test_test_visibility(self):
         # test of simple visibility tests based on bounding box projection
         self.assertTrue(geometry.test_visibility(self._obj1, self._cam, self._w, self._h),
@@ -72,6 +94,16 @@ class TestGeometry(unittest.TestCase):
         self.assertFalse(geometry.test_visibility(self._obj_non_visible, self._cam, self._w, self._h),
                          'Non visible object appears visible')
     
+    def test_project_points_to_pixel_coords(self):
+        # vectorized projection must agree with projecting each point individually
+        render = bpy.context.scene.render
+        points = np.array(self._obj1.bound_box) @ np.asarray(self._obj1.matrix_world)[:3, :3].T \
+            + np.asarray(self._obj1.matrix_world)[:3, 3]
+        pix = geometry.project_points_to_pixel_coords(points, self._cam, render)
+        pix_gt = np.array([geometry.p2d_to_pixel_coords(geometry.project_p3d(Vector(p), self._cam, render), render)
+                           for p in points])
+        npt.assert_almost_equal(pix_gt, pix, decimal=3, err_msg='Projected pixel coordinates are incorrect')
+
     def test_test_occlusion(self):
         # test of ray tracing occlusion test
         scene = bpy.context.scene
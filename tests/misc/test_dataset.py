@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2020 - for information on the respective copyright owner
+# see the NOTICE file and/or the repository
+# <https://github.com/boschresearch/amira-blender-rendering>.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+import numpy as np
+from amira_blender_rendering.dataset import get_index_range, split_index_range, seed_random_generators
+import tests
+
+
+"""Test file for the index range and seeding helpers in amira_blender_rendering.dataset"""
+
+
+@tests.register(name='test_misc')
+class TestDataset(unittest.TestCase):
+
+    def test_get_index_range(self):
+        self.assertEqual((0, 10), get_index_range(10))
+        self.assertEqual((0, 10), get_index_range(10, (None, None)))
+        self.assertEqual((3, 10), get_index_range(10, (3, None)))
+        self.assertEqual((0, 5), get_index_range(10, (None, 5)))
+        # clamp to [0, count]
+        self.assertEqual((0, 10), get_index_range(10, (-2, 20)))
+        self.assertEqual((10, 10), get_index_range(10, (12, None)))
+        # end is never smaller than start
+        self.assertEqual((7, 7), get_index_range(10, (7, 4)))
+
+    def test_split_index_range(self):
+        for index_range in [(0, 10), (3, 17), (0, 3), (5, 5)]:
+            for jobs in [1, 3, 4, 20]:
+                chunks = split_index_range(index_range, jobs)
+                self.assertLessEqual(len(chunks), jobs)
+                # chunks are non-empty, disjoint, and cover exactly [start, end)
+                indices = []
+                for start, end in chunks:
+                    self.assertLess(start, end)
+                    indices.extend(range(start, end))
+                self.assertEqual(list(range(*index_range)), indices,
+                                 f'Chunks {chunks} do not cover {index_range} for {jobs} jobs')
+
+    def test_seed_random_generators(self):
+        def draw(*keys):
+            seed_random_generators(42, *keys)
+            return random.random(), np.random.rand()
+
+        self.assertEqual(draw(3, 0), draw(3, 0), 'Same keys give different draws')
+        self.assertNotEqual(draw(3, 0), draw(3, 1), 'Different keys give same draws')
+        self.assertNotEqual(draw(3, 0), draw(4, 0), 'Different keys give same draws')
+
+        # no seed leaves the generators untouched
+        seed_random_generators(42, 3, 0)
+        state = np.random.get_state()[1].copy()
+        seed_random_generators(None, 3, 0)
+        self.assertTrue(np.array_equal(state, np.random.get_state()[1]))
+
+
+def main():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestDataset))
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+
+
+if __name__ == '__main__':
+    main()
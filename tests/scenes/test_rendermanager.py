@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2020 - for information on the respective copyright owner
+# see the NOTICE file and/or the repository
+# <https://github.com/boschresearch/amira-blender-rendering>.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import numpy.testing as npt
+import amira_blender_rendering.scenes.rendermanager as rm
+import tests
+
+"""Test file for main functionalities in amira_blender_rendering.scene.rendermanager"""
+
+
+@tests.register(name='test_scenes')
+class TestRenderManager(unittest.TestCase):
+
+    def setUp(self):
+        self._instance = rm.RenderManager()
+        self._tmpdir = tempfile.mkdtemp()
+
+    @unittest.skipIf(rm.cv2 is None, 'OpenCV not available')
+    def test_compute_2dbbox(self):
+        # non-square mask with an off-center blob, such that swapping width and
+        # height or flipping the image would change the bounding box
+        mask = np.zeros((30, 40), dtype=np.uint8)
+        mask[5:10, 20:32] = 255
+        fname_mask = os.path.join(self._tmpdir, 'mask.png')
+        rm.cv2.imwrite(fname_mask, mask)
+
+        # decode with OpenCV
+        box_cv2 = self._instance.compute_2dbbox(fname_mask)
+
+        # decode with blender
+        cv2 = rm.cv2
+        try:
+            rm.cv2 = None
+            box_blender = self._instance.compute_2dbbox(fname_mask)
+        finally:
+            rm.cv2 = cv2
+
+        self.assertIsNotNone(box_cv2)
+        npt.assert_array_equal(box_blender, box_cv2, err_msg='Bounding boxes from OpenCV and blender differ')
+
+    def tearDown(self):
+        self._instance.teardown()
+        shutil.rmtree(self._tmpdir)
+
+
+def main():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(TestRenderManager))
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
+
+
+if __name__ == '__main__':
+    main()